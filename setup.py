@@ -4,9 +4,9 @@
 # -*- coding: utf-8 -*-
 
 try:
-    from setuptools import setup
+    from setuptools import setup, Extension
 except ImportError:
-    from distutils.core import setup
+    from distutils.core import setup, Extension
 
 import versioneer
 
@@ -16,9 +16,55 @@ with open('README.rst') as f:
     README_RST = f.read()
 
 INSTALL_REQUIRES = [
-    'numpy', 'sortedcontainers',
+    'numpy',
 ]
-TEST_REQUIRES = ['pytest', 'coverage', 'pytest-cov']
+NUMBA_REQUIRES = ['numba']
+TEST_REQUIRES = ['pytest', 'coverage', 'pytest-cov', 'sortedcontainers']
+
+
+def _ext_modules():
+    ext_modules = []
+    # AOT-compiled DP kernels; without them, numba JIT-compiles at runtime
+    try:
+        from ssdts_matching._dp_aot import cc
+    except ImportError:
+        pass
+    else:
+        ext_modules.append(cc.distutils_extension())
+    # the Cython DP fill, used where numba is not available
+    try:
+        from Cython.Build import cythonize
+    except ImportError:
+        pass
+    else:
+        ext_modules.extend(cythonize([Extension(
+            'ssdts_matching._dp', ['ssdts_matching/_dp.pyx'])]))
+    return ext_modules
+
+
+EXT_MODULES = _ext_modules()
+
+# imported only now, as numba.pycc patches build_ext with the building of the
+# AOT-compiled kernels when _ext_modules() creates their extension
+try:
+    from setuptools.command import build_ext as build_ext_module
+except ImportError:
+    from distutils.command import build_ext as build_ext_module
+
+
+class OptimizingBuildExt(build_ext_module.build_ext):
+    """Builds the Cython DP fill with optimizations, for compilers known to
+    take the flags."""
+
+    def build_extension(self, ext):
+        if ext.name == 'ssdts_matching._dp' and \
+                self.compiler.compiler_type in ('unix', 'mingw32', 'cygwin'):
+            ext.extra_compile_args = ext.extra_compile_args + ['-O3']
+        super().build_extension(ext)
+
+
+CMDCLASS = versioneer.get_cmdclass()
+CMDCLASS['build_ext'] = OptimizingBuildExt
 
 
 setup(
@@ -28,12 +74,14 @@ setup(
     author="Shay Palachy",
     author_email="shaypal5@gmail.com",
     version=versioneer.get_version(),
-    cmdclass=versioneer.get_cmdclass(),
+    cmdclass=CMDCLASS,
     url='https://github.com/shaypal5/ssdts_matching',
     license="MIT",
     packages=['ssdts_matching'],
+    ext_modules=EXT_MODULES,
     install_requires=INSTALL_REQUIRES,
     extras_require={
+        'numba': NUMBA_REQUIRES,
         'test': TEST_REQUIRES
     },
     setup_requires=INSTALL_REQUIRES,
@@ -0,0 +1,82 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""Cython implementation of the banded dynamic matching DP fill.
+
+The ``_dp`` extension module is built from here by setup.py when Cython is
+available, and is used to fill the DP where numba is not.
+"""
+
+from libc.stdint cimport int32_t, int64_t, uint8_t
+
+ctypedef fused score_t:
+    int32_t
+    int64_t
+
+# the 2-bit direction codes of DP cells, as in core
+cdef enum:
+    DIAGONAL = 0
+    LEFT = 1
+    UP = 2
+
+
+def dp_fill(const int64_t[::1] ts1, const int64_t[::1] ts2,
+            const int64_t[::1] band_lo, const int64_t[::1] band_hi,
+            const int64_t[::1] band_offsets, score_t[::1] col_scores,
+            uint8_t[::1] directions, uint8_t[::1] right_left,
+            int64_t delta, int64_t unmatch_penalty):
+    """Fills the directions of the dynamic matching within the delta band.
+
+    Takes the same arrays as core._dp_fill, with col_scores either int32 or
+    int64, and fills them the same way.
+    """
+    cdef Py_ssize_t N = ts2.shape[0]
+    cdef Py_ssize_t i, j, lo, hi, known, offset, c
+    cdef int64_t right_const, dif
+    cdef score_t left_score, diag_score, up_score, min_score
+    cdef uint8_t min_direction
+    with nogil:
+        # the score of row i at column j is col_scores[j] for j <= known, and
+        # j * unmatch_penalty + right_const beyond it
+        col_scores[0] = 0
+        known = 0
+        right_const = 0
+        for i in range(1, N+1):
+            lo = band_lo[i-1] + 1
+            hi = band_hi[i-1]
+            if lo > hi:  # an empty band; the row is a copy of the one above
+                continue
+            for j in range(known+1, lo):
+                col_scores[j] = <score_t>(j * unmatch_penalty + right_const)
+            if lo - 1 > known:
+                known = lo - 1
+            left_score = col_scores[lo-1]
+            diag_score = col_scores[lo-1]
+            offset = band_offsets[i-1] - lo
+            for j in range(lo, hi+1):
+                if j <= known:
+                    up_score = col_scores[j]
+                else:
+                    up_score = <score_t>(j * unmatch_penalty + right_const)
+                # check up
+                min_score = up_score
+                min_direction = UP
+                # check left
+                if left_score + unmatch_penalty < min_score:
+                    min_score = <score_t>(left_score + unmatch_penalty)
+                    min_direction = LEFT
+                # check diagonal; diff < delta within the band
+                dif = ts1[j-1] - ts2[i-1]
+                if dif < 0:
+                    dif = -dif
+                diag_score = <score_t>(diag_score + dif)
+                if diag_score < min_score:
+                    min_score = diag_score
+                    min_direction = DIAGONAL
+                col_scores[j] = min_score
+                left_score = min_score
+                diag_score = up_score
+                c = offset + j
+                directions[c >> 2] |= min_direction << ((c & 3) << 1)
+            known = hi
+            if left_score - hi * unmatch_penalty < right_const:
+                right_const = left_score - hi * unmatch_penalty
+                right_left[i] = 1
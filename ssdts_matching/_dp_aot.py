@@ -0,0 +1,46 @@
+"""Ahead-of-time compilation of the dynamic matching DP kernels.
+
+The ``_dp_native`` extension module is built from here by setup.py, saving
+the JIT compilation of these kernels at runtime. If it is missing, the
+kernels are JIT-compiled by numba on first use.
+"""
+
+from numba.pycc import CC
+
+from .core import (
+    _dp_fill,
+    _hirschberg_match,
+)
+
+cc = CC('_dp_native')
+
+
+_FILL_SIGNATURE = (
+    'void(i8[:], i8[:], i8[:], i8[:], i8[:], {}[:], u1[:], u1[:], i8, i8)')
+
+
+@cc.export('dp_fill_int64', _FILL_SIGNATURE.format('i8'))
+def dp_fill_int64(ts1, ts2, band_lo, band_hi, band_offsets, col_scores,
+                  directions, right_left, delta, unmatch_penalty):
+    """Fills the directions of the dynamic matching within the delta band."""
+    _dp_fill(col_scores, directions, right_left, ts1, ts2, band_lo, band_hi,
+             band_offsets, delta, unmatch_penalty)
+
+
+@cc.export('dp_fill_int32', _FILL_SIGNATURE.format('i4'))
+def dp_fill_int32(ts1, ts2, band_lo, band_hi, band_offsets, col_scores,
+                  directions, right_left, delta, unmatch_penalty):
+    """Fills the directions of the dynamic matching within the delta band,
+    with int32 scores."""
+    _dp_fill(col_scores, directions, right_left, ts1, ts2, band_lo, band_hi,
+             band_offsets, delta, unmatch_penalty)
+
+
+@cc.export('hirschberg_match_int64', 'void(i8[:], i8[:], i8, i8, i8[:])')
+def hirschberg_match_int64(ts1, ts2, delta, unmatch_penalty, matches):
+    """Optimally matches two timestamp series in O(M+N) memory."""
+    _hirschberg_match(ts1, ts2, delta, unmatch_penalty, matches)
+
+
+if __name__ == '__main__':
+    cc.compile()
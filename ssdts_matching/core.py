@@ -1,9 +1,30 @@
 """Fast matching of source-sharing derivative time series."""
 
-from sys import maxsize
+import functools
+import itertools
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
-from sortedcontainers import SortedList
-from numpy import zeros
+import numpy as np
+
+try:
+    import numba
+    from numba import njit, prange
+except ImportError:  # the DP kernels run as Cython, or as plain Python
+    numba = None
+    prange = range
+
+    def njit(*args, **kwargs):
+        """A stand-in for numba.njit, leaving functions uncompiled."""
+        def _decorator(func):
+            return func
+        return _decorator
+
+
+def _as_timestamp_array(timestamps):
+    """Returns the given series of timestamps as a contiguous int64 array."""
+    return np.ascontiguousarray(np.asarray(timestamps, dtype=np.int64))
 
 
 def popping_greedy_timestamp_match(timestamps1, timestamps2, delta):
@@ -16,10 +37,12 @@ def popping_greedy_timestamp_match(timestamps1, timestamps2, delta):
 
     Arguments
     ---------
-    timestamps1 : sortedcontainers.SortedList
-        A sorted list of unique integers.
-    timestamps2 : sortedcontainers.SortedList
-        A sorted list of unique integers.
+    timestamps1 : array-like
+        A sorted sequence of unique integers, like a list, a numpy array or a
+        sortedcontainers.SortedList.
+    timestamps2 : array-like
+        A sorted sequence of unique integers, like a list, a numpy array or a
+        sortedcontainers.SortedList.
     delta : int
         The allowed difference between a matched pair of items from the two
         series.
@@ -30,39 +53,68 @@ def popping_greedy_timestamp_match(timestamps1, timestamps2, delta):
         A mapping of each matched value in the first series to the value in the
         second series it was matched to.
     """
-    timestamps1 = timestamps1.copy()
-    timestamps2 = timestamps2.copy()
+    ts1 = _as_timestamp_array(timestamps1)
+    ts2 = _as_timestamp_array(timestamps2)
     ts1_to_ts2 = {}
-    if len(timestamps1) < 1 or len(timestamps2) < 1:
+    if len(ts1) < 1 or len(ts2) < 1:
         return {}
-    for timestamp in timestamps1:
-        if timestamp in timestamps2:
-            ts1_to_ts2[timestamp] = timestamp
-            timestamps2.pop(timestamps2.index(timestamp))
+    N = len(ts2)
+    # all binary searches are done in one go, against the full second series
+    insert_ixs = np.searchsorted(ts2, ts1).tolist()
+    ts1 = ts1.tolist()
+    ts2 = ts2.tolist()
+    # popped series 2 stamps are spliced out of a doubly-linked list over their
+    # indices; a popped index keeps pointing past its popped neighbours, and
+    # every popped index a walk passes is pointed at where the walk ends
+    available = [True] * N
+    next_ix = list(range(1, N+1))
+    prev_ix = list(range(-1, N-1))
+    for timestamp, insert_ix in zip(ts1, insert_ixs):
+        # closest available series 2 stamp not smaller than the stamp
+        larger_ix = insert_ix
+        while larger_ix < N and not available[larger_ix]:
+            larger_ix = next_ix[larger_ix]
+        walked_ix = insert_ix
+        while walked_ix < larger_ix:
+            following_ix = next_ix[walked_ix]
+            next_ix[walked_ix] = larger_ix
+            walked_ix = following_ix
+        if larger_ix < N:
+            match_ix = larger_ix
+            closest = ts2[larger_ix]
+            dif = closest - timestamp
         else:
-            insert_ix = timestamps2.bisect(timestamp)
-            # if there are both larger and smaller series 2 ts than the stamp
-            if insert_ix < len(timestamps2):
-                closest_larger = timestamps2[insert_ix]
-                larger_dif = closest_larger - timestamp
-                closest_smaller = timestamps2[insert_ix-1]
-                smaller_dif = closest_smaller - timestamp
-                if larger_dif < abs(smaller_dif) and larger_dif < delta:
-                    ts1_to_ts2[timestamp] = closest_larger
-                    timestamps2.pop(insert_ix)
-                elif abs(smaller_dif) < delta:
-                    ts1_to_ts2[timestamp] = closest_smaller
-                    timestamps2.pop(insert_ix-1)
-                # else, this timstamp edge can't match to any timestamp from
-                # the second series
-            else:   # the largest timestamp from the second series is smaller
-                    # than current stamp
-                try:
-                    if timestamp - timestamps2[insert_ix-1] < delta:
-                        ts1_to_ts2[timestamp] = timestamps2[insert_ix-1]
-                    timestamps2.pop(insert_ix-1)
-                except IndexError:
-                    pass
+            match_ix = -1
+        if match_ix < 0 or dif > 0:  # no exact match
+            # closest available series 2 stamp smaller than the stamp
+            smaller_ix = insert_ix - 1
+            while smaller_ix >= 0 and not available[smaller_ix]:
+                smaller_ix = prev_ix[smaller_ix]
+            walked_ix = insert_ix - 1
+            while walked_ix > smaller_ix:
+                following_ix = prev_ix[walked_ix]
+                prev_ix[walked_ix] = smaller_ix
+                walked_ix = following_ix
+            if smaller_ix >= 0:
+                closest_smaller = ts2[smaller_ix]
+                # ties go to the smaller stamp
+                if match_ix < 0 or timestamp - closest_smaller <= dif:
+                    match_ix = smaller_ix
+                    closest = closest_smaller
+                    dif = timestamp - closest_smaller
+            if match_ix < 0 or dif >= delta:
+                # this timstamp edge can't match to any timestamp from the
+                # second series
+                continue
+        ts1_to_ts2[timestamp] = closest
+        # popping the matched stamp
+        available[match_ix] = False
+        prev_match_ix = prev_ix[match_ix]
+        next_match_ix = next_ix[match_ix]
+        if prev_match_ix >= 0:
+            next_ix[prev_match_ix] = next_match_ix
+        if next_match_ix < N:
+            prev_ix[next_match_ix] = prev_match_ix
     return ts1_to_ts2
 
 
@@ -76,10 +128,12 @@ def greedy_timestamp_match(timestamps1, timestamps2, delta, pop=False):
 
     Arguments
     ---------
-    timestamps1 : sortedcontainers.SortedList
-        A sorted list of unique integers.
-    timestamps2 : sortedcontainers.SortedList
-        A sorted list of unique integers.
+    timestamps1 : array-like
+        A sorted sequence of unique integers, like a list, a numpy array or a
+        sortedcontainers.SortedList.
+    timestamps2 : array-like
+        A sorted sequence of unique integers, like a list, a numpy array or a
+        sortedcontainers.SortedList.
     delta : int
         The allowed difference between a matched pair of items from the two
         series.
@@ -90,113 +144,541 @@ def greedy_timestamp_match(timestamps1, timestamps2, delta, pop=False):
         A mapping of each matched value in the first series to the value in the
         second series it was matched to.
     """
-    ts1_to_ts2 = {}
-    if len(timestamps1) < 1 or len(timestamps2) < 1:
-        return {}
-    for timestamp in timestamps1:
-        if timestamp in timestamps2:
-            ts1_to_ts2[timestamp] = timestamp
-        else:
-            insert_ix = timestamps2.bisect(timestamp)
-            # if there are both larger and smaller series 2 ts than the stamp
-            if insert_ix < len(timestamps2):
-                closest_larger = timestamps2[insert_ix]
-                larger_dif = closest_larger - timestamp
-                closest_smaller = timestamps2[insert_ix-1]
-                smaller_dif = closest_smaller - timestamp
-                if larger_dif < abs(smaller_dif) and larger_dif < delta:
-                    ts1_to_ts2[timestamp] = closest_larger
-                elif abs(smaller_dif) < delta:
-                    ts1_to_ts2[timestamp] = closest_smaller
-                # else, this timstamp edge can't match to any timestamp from
-                # the second series
-            else:   # the largest timestamp from the second series is smaller
-                    # than current stamp
-                try:
-                    if timestamp - timestamps2[insert_ix-1] < delta:
-                        ts1_to_ts2[timestamp] = timestamps2[insert_ix-1]
-                except IndexError:
-                    pass
+    ts1 = _as_timestamp_array(timestamps1)
+    ts2 = _as_timestamp_array(timestamps2)
+    ts1_to_ts2, _, _ = _greedy_with_flags(ts1, ts2, delta)
     return ts1_to_ts2
 
 
-START = 0
-DIAGONAL = 1
-UP = 2
-LEFT = 4
+def _greedy_with_flags(ts1, ts2, delta):
+    """Greedily matches two int64 timestamp arrays, also reporting whether the
+    matching is optimal.
 
+    Returns
+    -------
+    ts1_to_ts2 : dict
+        A mapping of each matched value in the first series to the value in the
+        second series it was matched to.
+    had_collision : bool
+        Whether some series 2 stamp was matched to more than one series 1
+        stamp.
+    unmatched_count : int
+        The number of unmatched series 1 stamps.
+    """
+    N = len(ts2)
+    if len(ts1) < 1 or N < 1:
+        return {}, False, len(ts1)
+    # the two neighbours of each stamp, found with a single binary search; at
+    # the edges of the second series both are the same edge stamp
+    insert_ixs = np.searchsorted(ts2, ts1, side='right')
+    smaller_ixs = np.maximum(insert_ixs - 1, 0)
+    larger_ixs = np.minimum(insert_ixs, N - 1)
+    smaller_difs = np.abs(ts1 - ts2[smaller_ixs])
+    larger_difs = np.abs(ts2[larger_ixs] - ts1)
+    # the closest of the two neighbours; ties go to the smaller
+    match_ixs = np.where(larger_difs < smaller_difs, larger_ixs, smaller_ixs)
+    difs = np.minimum(smaller_difs, larger_difs)
+    # exact matches are always taken
+    matched = (difs < delta) | (difs == 0)
+    match_ixs = match_ixs[matched]
+    # as the first series is sorted, matched series 2 indices never decrease,
+    # so a collision can only be with the previous match
+    had_collision = bool(np.any(match_ixs[1:] == match_ixs[:-1]))
+    ts1_to_ts2 = dict(zip(ts1[matched].tolist(), ts2[match_ixs].tolist()))
+    return ts1_to_ts2, had_collision, len(ts1) - len(ts1_to_ts2)
+
+
+# the step into each DP cell, as a 2-bit (up << 1) | left code; direction
+# matrices pack four cells per byte, and the (0, 0) start cell has no step
+DIAGONAL = 0
+LEFT = 1
+UP = 2
+_INT32_MAX = np.iinfo(np.int32).max
+# anti-diagonals shorter than this are not worth the cost of a parallel launch
+_PARALLEL_MIN_DIAGONAL = 2048
+# inputs with larger delta bands are matched in linear space, by
+# _hirschberg_match
+_MAX_DIRECTIONS_CELLS = 2 ** 28
+
+
+@njit(cache=True, nogil=True, boundscheck=False)
+def _dp_fill(col_scores, directions, right_left, ts1, ts2, band_lo, band_hi,
+             band_offsets, delta, unmatch_penalty):
+    """Fills the directions of the dynamic matching within the delta band.
+
+    A diagonal step into cell (i, j) is only allowed in the band of row i,
+    the columns j for which abs(ts1[j-1] - ts2[i-1]) < delta. Left of the
+    band every cell is reached from above, so it copies the row above it.
+    Right of the band, the scores of row i are j * unmatch_penalty plus a
+    constant of the row, so all its cells are reached in the same direction,
+    recorded in right_left. Only band cells are computed, in O(band) time.
 
-def dynamic_timestamp_match(timestamps1, timestamps2, delta):
-    """Optimally matches two timestamp series using dynamic programming.
+    Arguments
+    ---------
+    col_scores : numpy.ndarray
+        An int32 or int64 array of length M+1, used as scratch space for the
+        latest computed score of each column.
+    directions : numpy.ndarray
+        A zeroed uint8 array of length band_cells//4+1, filled in place with
+        the 2-bit direction codes of band cells, row by row, four to a byte.
+    right_left : numpy.ndarray
+        A zeroed uint8 array of length N+1. Set for every row whose cells right
+        of its band are reached from the left, rather than from above.
+    ts1 : numpy.ndarray
+        An int64 array of length M of the first series of timestamps.
+    ts2 : numpy.ndarray
+        An int64 array of length N of the second series of timestamps.
+    band_lo : numpy.ndarray
+        An int64 array of length N. The band of row i starts at column
+        band_lo[i-1]+1.
+    band_hi : numpy.ndarray
+        An int64 array of length N. The band of row i ends at column
+        band_hi[i-1], inclusive.
+    band_offsets : numpy.ndarray
+        An int64 array of length N, with the index of the first cell of the
+        band of row i in directions at band_offsets[i-1].
+    delta : int
+        The allowed delta, in seconds, between a matched timestamp pair.
+    unmatch_penalty : int
+        The penalty for leaving a timestamp of the first series unmatched.
+    """
+    N = len(ts2)
+    # the diagonal step costs of the band of the current row, by column
+    diag_costs = np.empty(len(col_scores), dtype=np.int64)
+    # the score of row i at column j is col_scores[j] for j <= known, and
+    # j * unmatch_penalty + right_const beyond it
+    col_scores[0] = 0
+    known = 0
+    right_const = 0
+    for i in range(1, N+1):
+        lo = band_lo[i-1] + 1
+        hi = band_hi[i-1]
+        if lo > hi:  # an empty band; the row is a copy of the one above
+            continue
+        for j in range(known+1, lo):
+            col_scores[j] = j * unmatch_penalty + right_const
+        known = max(known, lo-1)
+        left_score = col_scores[lo-1]
+        diag_score = col_scores[lo-1]
+        offset = band_offsets[i-1] - lo
+        # computed apart from the min selection, so that they are vectorized
+        timestamp = ts2[i-1]
+        for j in range(lo, hi+1):
+            diag_costs[j] = abs(ts1[j-1] - timestamp)
+        for j in range(lo, hi+1):
+            up_score = col_scores[j] if j <= known else \
+                j * unmatch_penalty + right_const
+            left_score += unmatch_penalty
+            # diff < delta within the band
+            diag_score += diag_costs[j]
+            # the data-dependent step choice is made with selects rather than
+            # branches; ties go to up, then to left
+            take_left = left_score < up_score
+            min_score = left_score if take_left else up_score
+            min_direction = LEFT if take_left else UP
+            take_diag = diag_score < min_score
+            min_score = diag_score if take_diag else min_score
+            min_direction = DIAGONAL if take_diag else min_direction
+            col_scores[j] = min_score
+            left_score = min_score
+            diag_score = up_score
+            c = offset + j
+            directions[c >> 2] |= min_direction << ((c & 3) << 1)
+        known = hi
+        if left_score - hi * unmatch_penalty < right_const:
+            right_const = left_score - hi * unmatch_penalty
+            right_left[i] = 1
+
+
+@njit(parallel=True, cache=True, nogil=True, boundscheck=False)
+def _dp_fill_parallel(directions, ts1, ts2, delta, unmatch_penalty):
+    """Fills the direction matrix of the dynamic matching by anti-diagonals.
+
+    Every cell (i, j) on the anti-diagonal k=i+j depends only on cells of the
+    two previous anti-diagonals, so each anti-diagonal is filled in parallel.
+    Scores are kept in three rolling anti-diagonal buffers, indexed by i.
 
-    Runs in O(M*N), where M=len(timestamps1) and N=len(timestamps2).
-    Guarentees an optimal solution error-wise, where the error is the sum of
-    differences between matched pairs.
+    Arguments
+    ---------
+    directions : numpy.ndarray
+        A zeroed uint8 matrix of shape (N+1, M//4+1), filled in place with the
+        2-bit direction codes of the cells, four to a byte.
+    ts1 : numpy.ndarray
+        An int64 array of length M of the first series of timestamps.
+    ts2 : numpy.ndarray
+        An int64 array of length N of the second series of timestamps.
+    delta : int
+        The allowed delta, in seconds, between a matched timestamp pair.
+    unmatch_penalty : int
+        The penalty for leaving a timestamp of the first series unmatched.
+    """
+    N = len(ts2)
+    M = len(ts1)
+    diags = np.zeros((3, N+1), dtype=np.int64)
+    for k in range(1, M+N+1):
+        cur = diags[k % 3]
+        prev = diags[(k-1) % 3]
+        prev2 = diags[(k-2) % 3]
+        for i in prange(max(0, k-M), min(N, k)+1):
+            j = k - i
+            if i == 0:  # the first row can only be reached from the left
+                min_score = prev[i] + unmatch_penalty
+                min_direction = LEFT
+            else:
+                up_score = prev[i-1]
+                min_score = up_score
+                min_direction = UP
+                if j > 0:
+                    left_score = prev[i] + unmatch_penalty
+                    diff = abs(ts1[j-1] - ts2[i-1])
+                    diag_score = prev2[i-1] + diff
+                    # selects rather than branches, as in _dp_fill
+                    take_left = left_score < up_score
+                    min_score = left_score if take_left else up_score
+                    min_direction = LEFT if take_left else UP
+                    take_diag = (diag_score < min_score) & (diff < delta)
+                    min_score = diag_score if take_diag else min_score
+                    min_direction = DIAGONAL if take_diag else min_direction
+            cur[i] = min_score
+            # cells sharing a byte are on different anti-diagonals
+            directions[i, j >> 2] |= min_direction << ((j & 3) << 1)
+
+
+@njit(cache=True, nogil=True, boundscheck=False)
+def _dp_score_only(ts1, ts2, delta, unmatch_penalty):
+    """Computes the last row of the dynamic matching score matrix.
+
+    Only the delta band of each row is computed, as in _dp_fill, with the
+    latest score of each column kept in a single row, so this takes O(M)
+    memory and O(M+N+band) time.
 
     Arguments
     ---------
-    timestamps1 : list
-        A list of integers representing a series of timestamps.
-    timestamps2 : list
-        A list of integers representing a series of timestamps.
+    ts1 : numpy.ndarray
+        A sorted int64 array of length M of the first series of timestamps.
+    ts2 : numpy.ndarray
+        A sorted int64 array of length N of the second series of timestamps.
     delta : int
         The allowed delta, in seconds, between a matched timestamp pair.
+    unmatch_penalty : int
+        The penalty for leaving a timestamp of the first series unmatched.
 
     Returns
     -------
-    ts1_to_ts2 : dict
-        A mapping of each matched value in the first series to the value in the
-        second series it was matched to.
+    scores : numpy.ndarray
+        An int64 array of length M+1, where scores[j] is the score of the
+        optimal matching of ts1[:j] and all of ts2.
+    """
+    N = len(ts2)
+    M = len(ts1)
+    col_scores = np.empty(M+1, dtype=np.int64)
+    # the score at column j is col_scores[j] for j <= known, and
+    # j * unmatch_penalty + right_const beyond it
+    col_scores[0] = 0
+    known = 0
+    right_const = 0
+    # the band of row i is columns band_lo+1 to band_hi, as by _delta_band
+    band_lo = 0
+    band_hi = 0
+    for i in range(1, N+1):
+        timestamp = ts2[i-1]
+        while band_lo < M and ts1[band_lo] <= timestamp - delta:
+            band_lo += 1
+        while band_hi < M and ts1[band_hi] < timestamp + delta:
+            band_hi += 1
+        lo = band_lo + 1
+        hi = band_hi
+        if lo > hi:  # an empty band; the row is a copy of the one above
+            continue
+        for j in range(known+1, lo):
+            col_scores[j] = j * unmatch_penalty + right_const
+        known = max(known, lo-1)
+        left_score = col_scores[lo-1]
+        diag_score = col_scores[lo-1]
+        for j in range(lo, hi+1):
+            up_score = col_scores[j] if j <= known else \
+                j * unmatch_penalty + right_const
+            left_score += unmatch_penalty
+            # diff < delta within the band
+            diag_score += abs(ts1[j-1] - timestamp)
+            min_score = min(up_score, left_score, diag_score)
+            col_scores[j] = min_score
+            left_score = min_score
+            diag_score = up_score
+        known = hi
+        right_const = min(right_const, left_score - hi * unmatch_penalty)
+    for j in range(known+1, M+1):
+        col_scores[j] = j * unmatch_penalty + right_const
+    return col_scores
+
+
+@njit(cache=True, nogil=True, boundscheck=False)
+def _hirschberg_match(ts1, ts2, delta, unmatch_penalty, matches):
+    """Optimally matches two timestamp series in O(M+N) memory, using
+    Hirschberg's divide-and-conquer scheme.
+
+    Every sub-problem, the bounds (lo1, hi1, lo2, hi2) of a quadrant of the
+    score matrix, is solved for its middle series 2 stamp: a forward pass over
+    the rows above it and a reverse pass over the rows below it give the
+    score of every way the optimal path can cross its row, either matching
+    it to some series 1 stamp or skipping it. The best one is recorded, and
+    the two quadrants it leaves are solved next. No direction matrix is kept.
+
+    Arguments
+    ---------
+    ts1 : numpy.ndarray
+        An int64 array of length M of the first series of timestamps.
+    ts2 : numpy.ndarray
+        An int64 array of length N of the second series of timestamps.
+    delta : int
+        The allowed delta, in seconds, between a matched timestamp pair.
+    unmatch_penalty : int
+        The penalty for leaving a timestamp of the first series unmatched.
+    matches : numpy.ndarray
+        An int64 array of length N filled with -1, where the index of the
+        series 1 stamp each series 2 stamp is matched to is set.
     """
+    # every pending sub-problem has rows of its own, so N+1 slots suffice
+    stack = np.empty((len(ts2) + 1, 4), dtype=np.int64)
+    stack[0, 0] = 0
+    stack[0, 1] = len(ts1)
+    stack[0, 2] = 0
+    stack[0, 3] = len(ts2)
+    size = 1
+    while size > 0:
+        size -= 1
+        lo1 = stack[size, 0]
+        hi1 = stack[size, 1]
+        lo2 = stack[size, 2]
+        hi2 = stack[size, 3]
+        M = hi1 - lo1
+        mid = (lo2 + hi2) // 2
+        sub_ts1 = ts1[lo1:hi1]
+        top_scores = _dp_score_only(
+            sub_ts1, ts2[lo2:mid], delta, unmatch_penalty)
+        # negated, the reversed series are sorted again, with the same diffs
+        bottom_scores = _dp_score_only(
+            -sub_ts1[::-1], -ts2[mid+1:hi2][::-1], delta, unmatch_penalty)
+        # skipping ts2[mid] with the path crossing its row at column 0
+        best_score = top_scores[0] + bottom_scores[M]
+        split = 0
+        matched = False
+        for j in range(M+1):
+            skip_score = top_scores[j] + bottom_scores[M-j]
+            if skip_score < best_score:
+                best_score = skip_score
+                split = j
+                matched = False
+            if j < M:
+                diff = abs(sub_ts1[j] - ts2[mid])
+                match_score = top_scores[j] + diff + bottom_scores[M-j-1]
+                if match_score < best_score and diff < delta:
+                    best_score = match_score
+                    split = j
+                    matched = True
+        right_lo1 = lo1 + split
+        if matched:
+            matches[mid] = lo1 + split
+            right_lo1 += 1
+        if split > 0 and mid > lo2:
+            stack[size, 0] = lo1
+            stack[size, 1] = lo1 + split
+            stack[size, 2] = lo2
+            stack[size, 3] = mid
+            size += 1
+        if right_lo1 < hi1 and hi2 > mid + 1:
+            stack[size, 0] = right_lo1
+            stack[size, 1] = hi1
+            stack[size, 2] = mid + 1
+            stack[size, 3] = hi2
+            size += 1
+
+
+try:
+    from . import _dp_native
+except ImportError:  # not built; the numba kernels are JIT-compiled on use
+    _dp_native = None
+try:
+    from . import _dp
+except ImportError:  # not built; Cython is optional
+    _dp = None
+
+
+# threads matching delta partitions concurrently set jit_only, to use the
+# JIT-compiled kernels, which unlike the AOT-compiled ones release the GIL,
+# and never the parallel fill, as numba's workqueue threading layer can not
+# be used by several threads at once
+_kernel_selection = threading.local()
+
+
+def _native_kernels(delta):
+    """Whether the AOT-compiled kernels can be used with the given delta."""
+    return _dp_native is not None and \
+        isinstance(delta, (int, np.integer)) and \
+        not getattr(_kernel_selection, 'jit_only', False)
+
+
+def _delta_band(ts1, ts2, delta):
+    """Returns the band_lo and band_hi arrays of the delta band of the
+    dynamic matching of two int64 timestamp arrays."""
+    band_lo = np.searchsorted(ts1, ts2 - delta, side='right')
+    band_hi = np.searchsorted(ts1, ts2 + delta, side='left')
+    # with a zero delta no pair can be matched and the band is empty
+    return band_lo, np.maximum(band_hi, band_lo)
+
+
+def _directions_match(
+        ts1, ts2, band_lo, band_hi, delta, unmatch_penalty, ts1_to_ts2):
+    """Matches two int64 timestamp arrays by filling the directions of their
+    delta band and walking the optimal path back from the matrix corner,
+    adding matched pairs to the given dict."""
     #   Matrix shape:
     #    ____M____
     #    |?|...|?|
     #  N |:|...|:|
     #    |?|...|?|
-    unmatch_penalty = delta * 10
-    M = len(timestamps1)
-    N = len(timestamps2)
-    scores = zeros((N+1, M+1))
-    directions = zeros((N+1, M+1))  # 1=diagonal, 2=up, 4=left, 0=start
-    scores[0, 0] = 0
-    directions[0, 0] = START
-    for i in range(N+1):
-        for j in range(M+1):
-            if i == 0 and j == 0:
-                continue
-            min_score = maxsize
-            min_direction = START
-            if i > 0:  # check up
-                min_score = scores[i-1, j]
-                min_direction = UP
-            if j > 0:  # check left
-                left_score = scores[i, j-1] + unmatch_penalty
-                if left_score < min_score:
-                    min_score = left_score
-                    min_direction = LEFT
-                if i > 0:  # check diagonal
-                    diff = abs(timestamps1[j-1] - timestamps2[i-1])
-                    diag_score = scores[i-1, j-1] + diff
-                    if diag_score < min_score and diff < delta:
-                        min_score = diag_score
-                        min_direction = DIAGONAL
-            scores[i, j] = min_score
-            directions[i, j] = min_direction
+    M = len(ts1)
+    N = len(ts2)
+    band_widths = band_hi - band_lo
+    band_cells = int(band_widths.sum())
+    if numba is None or getattr(_kernel_selection, 'jit_only', False):
+        num_threads = 1
+    else:
+        num_threads = numba.get_num_threads()
+    if num_threads > 1 and min(M, N) >= _PARALLEL_MIN_DIAGONAL and \
+            band_cells * num_threads > (N+1) * (M+1) and \
+            (N+1) * (M+1) <= _MAX_DIRECTIONS_CELLS:
+        # a dense band is filled faster in full, in parallel
+        _parallel_directions_match(
+            ts1, ts2, delta, unmatch_penalty, ts1_to_ts2)
+        return
+    band_offsets = np.cumsum(band_widths) - band_widths
+    directions = np.zeros(band_cells // 4 + 1, dtype=np.uint8)
+    right_left = np.zeros(N+1, dtype=np.uint8)
+    # no score can exceed that of leaving all of series 1 unmatched
+    if unmatch_penalty * (M + N) < _INT32_MAX:
+        col_scores = np.empty(M+1, dtype=np.int32)
+    else:
+        col_scores = np.empty(M+1, dtype=np.int64)
+    if _native_kernels(delta):
+        if col_scores.dtype == np.int32:
+            native_fill = _dp_native.dp_fill_int32
+        else:
+            native_fill = _dp_native.dp_fill_int64
+        native_fill(
+            ts1, ts2, band_lo, band_hi, band_offsets, col_scores, directions,
+            right_left, delta, unmatch_penalty)
+    elif numba is None and _dp is not None and \
+            isinstance(delta, (int, np.integer)):
+        _dp.dp_fill(
+            ts1, ts2, band_lo, band_hi, band_offsets, col_scores, directions,
+            right_left, delta, unmatch_penalty)
+    else:
+        _dp_fill(
+            col_scores, directions, right_left, ts1, ts2, band_lo, band_hi,
+            band_offsets, delta, unmatch_penalty)
     # walking the path
-    ts1_to_ts2 = {}
+    ts1 = ts1.tolist()
+    ts2 = ts2.tolist()
+    band_lo = band_lo.tolist()
+    band_hi = band_hi.tolist()
+    band_offsets = band_offsets.tolist()
+    right_left = right_left.tolist()
     i = N
     j = M
-    next_direction = directions[i, j]
-    while next_direction != START:
-        if next_direction == DIAGONAL:
-            ts1_to_ts2[timestamps1[j-1]] = timestamps2[i-1]
+    while i > 0 and j > 0:
+        lo = band_lo[i-1] + 1
+        hi = band_hi[i-1]
+        if j < lo or lo > hi:
+            next_direction = UP
+        elif j > hi:
+            next_direction = LEFT if right_left[i] else UP
+        else:
+            c = band_offsets[i-1] + j - lo
+            next_direction = (directions[c >> 2] >> ((c & 3) << 1)) & 3
+        if next_direction == UP:
             i -= 1
+        elif next_direction == LEFT:
             j -= 1
-        elif next_direction == UP:
+        else:  # diagonal
+            ts1_to_ts2[ts1[j-1]] = ts2[i-1]
+            i -= 1
+            j -= 1
+
+
+def _parallel_directions_match(ts1, ts2, delta, unmatch_penalty, ts1_to_ts2):
+    """Matches two int64 timestamp arrays by filling the full direction matrix
+    in parallel and walking the optimal path back from its corner, adding
+    matched pairs to the given dict."""
+    M = len(ts1)
+    N = len(ts2)
+    directions = np.zeros((N+1, M//4 + 1), dtype=np.uint8)
+    _dp_fill_parallel(directions, ts1, ts2, delta, unmatch_penalty)
+    # walking the path
+    ts1 = ts1.tolist()
+    ts2 = ts2.tolist()
+    i = N
+    j = M
+    while i > 0 and j > 0:
+        next_direction = (directions[i, j >> 2] >> ((j & 3) << 1)) & 3
+        if next_direction == UP:
             i -= 1
         elif next_direction == LEFT:
             j -= 1
-        next_direction = directions[i, j]
+        else:  # diagonal
+            ts1_to_ts2[ts1[j-1]] = ts2[i-1]
+            i -= 1
+            j -= 1
+
+
+def dynamic_timestamp_match(timestamps1, timestamps2, delta):
+    """Optimally matches two timestamp series using dynamic programming.
+
+    Runs in O(M*N), where M=len(timestamps1) and N=len(timestamps2), but only
+    does work for pairs of timestamps less than delta apart, which for sparse
+    series is far fewer. Guarentees an optimal solution error-wise, where the
+    error is the sum of differences between matched pairs. Series with too
+    many such pairs for a direction matrix are matched in O(M+N) memory, using
+    Hirschberg's algorithm.
+
+    Arguments
+    ---------
+    timestamps1 : list
+        A list of integers representing a series of timestamps.
+    timestamps2 : list
+        A list of integers representing a series of timestamps.
+    delta : int
+        The allowed delta, in seconds, between a matched timestamp pair.
+
+    Returns
+    -------
+    ts1_to_ts2 : dict
+        A mapping of each matched value in the first series to the value in the
+        second series it was matched to.
+    """
+    timestamps1 = _as_timestamp_array(timestamps1)
+    timestamps2 = _as_timestamp_array(timestamps2)
+    unmatch_penalty = delta * 10
+    ts1_to_ts2 = {}
+    if len(timestamps1) < 1 or len(timestamps2) < 1:
+        return ts1_to_ts2
+    band_lo, band_hi = _delta_band(timestamps1, timestamps2, delta)
+    if (band_hi - band_lo).sum() <= _MAX_DIRECTIONS_CELLS:
+        _directions_match(
+            timestamps1, timestamps2, band_lo, band_hi, delta,
+            unmatch_penalty, ts1_to_ts2)
+        return ts1_to_ts2
+    matches = np.full(len(timestamps2), -1, dtype=np.int64)
+    if _native_kernels(delta):
+        _dp_native.hirschberg_match_int64(
+            timestamps1, timestamps2, delta, unmatch_penalty, matches)
+    else:
+        _hirschberg_match(
+            timestamps1, timestamps2, delta, unmatch_penalty, matches)
+    matched_ixs2 = np.flatnonzero(matches >= 0)
+    ts1_to_ts2.update(zip(
+        timestamps1[matches[matched_ixs2]].tolist(),
+        timestamps2[matched_ixs2].tolist()))
     return ts1_to_ts2
 
 
@@ -232,13 +714,15 @@ def hybrid_timestamp_match(timestamps1, timestamps2, delta):
         A mapping of each matched value in the first series to the value in the
         second series it was matched to.
     """
+    timestamps1 = _as_timestamp_array(timestamps1)
+    timestamps2 = _as_timestamp_array(timestamps2)
     # start by trying to match with the faster, greedy approach
-    ts1_to_ts2 = greedy_timestamp_match(timestamps1, timestamps2, delta)
+    ts1_to_ts2, had_collision, unmatched_count = _greedy_with_flags(
+        timestamps1, timestamps2, delta)
     dynamic = 0
     greedy = 0
     # if some series1 stamps are matched to the same series2 stamps,
-    if len(set(ts1_to_ts2.values())) < len(ts1_to_ts2.values()) or \
-            len(ts1_to_ts2.keys()) < len(timestamps1):  # or are unmatched...
+    if had_collision or unmatched_count > 0:  # or are unmatched...
         # then greedy algo found a sub-optimal solution, so we go dynamic.
         ts1_to_ts2 = dynamic_timestamp_match(timestamps1, timestamps2, delta)
         dynamic += 1
@@ -247,6 +731,34 @@ def hybrid_timestamp_match(timestamps1, timestamps2, delta):
     return ts1_to_ts2
 
 
+# only sub-problems of up to this many stamps in total are memoized, keeping
+# the memory held by the cache of _relative_hybrid_match bounded
+_MEMOIZE_MAX_STAMPS = 64
+
+
+@functools.lru_cache(maxsize=4096)
+def _relative_hybrid_match(rel_ts1_bytes, rel_ts2_bytes, delta):
+    """Returns the hybrid matching of two int64 timestamp arrays, given as
+    bytes of their offsets from a shared base, as a tuple of pairs of matched
+    offsets."""
+    matching = hybrid_timestamp_match(
+        np.frombuffer(rel_ts1_bytes, dtype=np.int64),
+        np.frombuffer(rel_ts2_bytes, dtype=np.int64), delta)
+    return tuple(matching.items())
+
+
+def _memoized_hybrid_match(sub_ts1, sub_ts2, delta):
+    """Matches two int64 timestamp arrays using the hybrid approach, reusing
+    the matching of any earlier small sub-problem identical up to a shift."""
+    if len(sub_ts1) + len(sub_ts2) > _MEMOIZE_MAX_STAMPS:
+        return hybrid_timestamp_match(sub_ts1, sub_ts2, delta)
+    base = sub_ts1[0]
+    rel_matching = _relative_hybrid_match(
+        (sub_ts1 - base).tobytes(), (sub_ts2 - base).tobytes(), delta)
+    base = int(base)
+    return {rel1 + base: rel2 + base for rel1, rel2 in rel_matching}
+
+
 def vertical_aligned_timestamp_match(timestamps1, timestamps2, delta):
     """Matches two timestamps series by partioning them by verticals (pairs of
     timestamps from both series with identical values) and matching each
@@ -271,37 +783,73 @@ def vertical_aligned_timestamp_match(timestamps1, timestamps2, delta):
         A mapping of each matched value in the first series to the value in the
         second series it was matched to.
     """
-    if len(timestamps1) < 1 or len(timestamps2) < 1:
+    ts1 = _as_timestamp_array(timestamps1)
+    ts2 = _as_timestamp_array(timestamps2)
+    if len(ts1) < 1 or len(ts2) < 1:
         return {}
-    ts1_to_ts2 = {}
-    ts1_left_tip = -1
-    ts2_left_tip = -1
-    for i, timestamp in enumerate(timestamps1):
-        if timestamp in timestamps2 or i == (len(timestamps1)-1):
-            # Updating right tips
-            if timestamp in timestamps2:
-                ts1_to_ts2[timestamp] = timestamp
-                ts2_right_tip = timestamps2.bisect(timestamp) - 1
-            else:
-                ts2_right_tip = len(timestamps2)
-            ts1_right_tip = i
-            if (i - ts1_left_tip > 1) or (i == (len(timestamps1)-1)):
-                # Sending a sub-problem...
-                if i == len(timestamps1) - 1:  # we arrived at the edge...
-                    ts1_right_tip = i + 1
-                    ts2_right_tip = len(timestamps2) + 1
-                sub_ts1 = SortedList(timestamps1[ts1_left_tip+1:ts1_right_tip])
-                sub_ts2 = SortedList(timestamps2[
-                    ts2_left_tip+1:ts2_right_tip])
-                sub_ts1_2_ts2 = hybrid_timestamp_match(sub_ts1, sub_ts2, delta)
-                ts1_to_ts2.update(sub_ts1_2_ts2)
-            ts1_left_tip = ts1_right_tip
-            ts2_left_tip = ts2_right_tip
+    M = len(ts1)
+    N = len(ts2)
+    # positions of verticals in both series
+    vert_ixs1 = np.flatnonzero(np.isin(ts1, ts2, assume_unique=True))
+    verticals = ts1[vert_ixs1].tolist()
+    ts1_to_ts2 = dict(zip(verticals, verticals))
+    if len(vert_ixs1) > 0 and vert_ixs1[-1] == M - 1:
+        # a vertical at the edge is also matched as part of the last partition
+        vert_ixs1 = vert_ixs1[:-1]
+    vert_ixs2 = np.searchsorted(ts2, ts1[vert_ixs1])
+    # sub-problems lie between consecutive verticals, and the series edges
+    lows1 = np.concatenate(([0], vert_ixs1 + 1)).tolist()
+    highs1 = np.concatenate((vert_ixs1, [M])).tolist()
+    lows2 = np.concatenate(([0], vert_ixs2 + 1)).tolist()
+    highs2 = np.concatenate((vert_ixs2, [N])).tolist()
+    for lo1, hi1, lo2, hi2 in zip(lows1, highs1, lows2, highs2):
+        if lo1 < hi1 and lo2 < hi2:
+            ts1_to_ts2.update(_memoized_hybrid_match(
+                ts1[lo1:hi1], ts2[lo2:hi2], delta))
     return ts1_to_ts2
 
 
+# matching functions doing most of their work in the DP kernels, which the
+# numba JIT-compiled versions of run without holding the GIL
+_GIL_RELEASING_MATCHING_FUNCS = (
+    dynamic_timestamp_match,
+    hybrid_timestamp_match,
+    vertical_aligned_timestamp_match,
+)
+
+
+def _jit_kernels_match(matching_func, timestamps1, timestamps2, delta):
+    """Matches two timestamp series with the given matching function, using
+    only the JIT-compiled DP kernels in the calling thread."""
+    _kernel_selection.jit_only = True
+    try:
+        return matching_func(timestamps1, timestamps2, delta)
+    finally:
+        _kernel_selection.jit_only = False
+
+
+def _partition_executor(matching_func, n_jobs):
+    """Returns an executor to match delta partitions concurrently with, and
+    the function to map over it."""
+    if matching_func in _GIL_RELEASING_MATCHING_FUNCS and numba is not None:
+        # launches the numba threading layer here; launched by a worker
+        # thread, it hangs the interpreter on exit
+        numba.get_num_threads()
+        return ThreadPoolExecutor(max_workers=n_jobs), functools.partial(
+            _jit_kernels_match, matching_func)
+    # arbitrary matching functions, and the Cython and plain Python kernels,
+    # hold the GIL; workers are not forked from this process, as forking it
+    # after numba has launched its threading layer hangs it on exit
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        mp_context = multiprocessing.get_context('forkserver')
+    else:
+        mp_context = multiprocessing.get_context('spawn')
+    executor = ProcessPoolExecutor(max_workers=n_jobs, mp_context=mp_context)
+    return executor, matching_func
+
+
 def delta_partitioned_timestamp_match(
-        timestamps1, timestamps2, delta, matching_func=None):
+        timestamps1, timestamps2, delta, matching_func=None, n_jobs=None):
     """"Attempts to match the two given series of timestamps by partioning
     the first series into 2*delta-separated buckets, and applying the given
     matching function to each, combining the sub-solution into a matching.
@@ -322,6 +870,16 @@ def delta_partitioned_timestamp_match(
         The allowed delta, in seconds, between a matched timestamp pair.
     matching_func : function, optional
         The matching function to use. Defaults to hybrid_timestamp_match.
+        Sub-series are given to it as int64 numpy arrays.
+    n_jobs : int, optional
+        The number of buckets to match concurrently. Buckets are matched in
+        threads if the matching function is one of this package's dynamic
+        matching based functions and numba is installed, on the numba
+        JIT-compiled kernels, which release the GIL. Otherwise they are
+        matched in processes; the matching function must then be picklable,
+        and calling scripts must guard their entry point with
+        ``if __name__ == '__main__'``, as worker processes are not forked.
+        Defaults to matching buckets one by one.
 
     Returns
     -------
@@ -333,27 +891,28 @@ def delta_partitioned_timestamp_match(
         matching_func = hybrid_timestamp_match
     if len(timestamps1) < 1 or len(timestamps2) < 1:
         return {}, len(timestamps1), len(timestamps2)
+    ts1 = _as_timestamp_array(timestamps1)
+    ts2 = _as_timestamp_array(timestamps2)
     # Breaking things up to 2 * delta-seperated buckets...
+    bucket_starts = np.flatnonzero(np.diff(ts1) > 2 * delta + 1) + 1
+    sub_ts1s = np.split(ts1, bucket_starts)
+    sub_ts2s = []
+    for sub_ts1 in sub_ts1s:
+        sub_ts2_lo = np.searchsorted(ts2, sub_ts1[0] - delta, side='left')
+        sub_ts2_hi = np.searchsorted(ts2, sub_ts1[-1] + delta, side='right')
+        sub_ts2s.append(ts2[sub_ts2_lo:sub_ts2_hi])
+    # Sending sub-problems...
     ts1_to_ts2 = {}
-    ts1_left_tip = 0
-    ts1_right_tip = -1
-    for i, timestamp in enumerate(timestamps1):
-        if i == 0:
-            continue
-        dist_to_prev = timestamp - timestamps1[i-1]
-        if dist_to_prev > 2 * delta + 1 or i == (len(timestamps1)-1):
-            # Updating right tip!
-            ts1_right_tip = i
-            if i == len(timestamps1) - 1:  # we arrived at the edge...
-                ts1_right_tip = i + 1
-            # Sending a sub-problem...
-            sub_ts1 = SortedList(timestamps1[ts1_left_tip:ts1_right_tip])
-            sub_ts2 = SortedList([
-                ts for ts in timestamps2
-                if (timestamps1[ts1_left_tip] - ts < delta) or (
-                    ts - timestamps1[ts1_right_tip-1] < delta)
-            ])
-            sub_ts1_to_ts2 = matching_func(sub_ts1, sub_ts2, delta)
+    if n_jobs is None or n_jobs < 2 or len(sub_ts1s) < 2:
+        for sub_ts1, sub_ts2 in zip(sub_ts1s, sub_ts2s):
+            ts1_to_ts2.update(matching_func(sub_ts1, sub_ts2, delta))
+        return ts1_to_ts2
+    # processes are sent several buckets at a time; threads ignore chunksize
+    chunksize = max(1, len(sub_ts1s) // (4 * n_jobs))
+    executor, partition_func = _partition_executor(matching_func, n_jobs)
+    with executor:
+        for sub_ts1_to_ts2 in executor.map(
+                partition_func, sub_ts1s, sub_ts2s, itertools.repeat(delta),
+                chunksize=chunksize):
             ts1_to_ts2.update(sub_ts1_to_ts2)
-            ts1_left_tip = ts1_right_tip
     return ts1_to_ts2
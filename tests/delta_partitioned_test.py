@@ -0,0 +1,109 @@
+"""Test the delta_partitioned_timestamp_match function."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import ssdts_matching as ssdts
+from ssdts_matching import core
+
+from .shared import (
+    SHORT_SERIES_1,
+    SHORT_SERIES_2,
+)
+
+
+def test_delta_partitioned_1():
+    """Test 1 for the delta_partitioned_timestamp_match function."""
+    res1 = ssdts.delta_partitioned_timestamp_match(
+        SHORT_SERIES_1, SHORT_SERIES_2, 1)
+    assert res1 == {3: 3, 10: 10}
+
+    res2 = ssdts.delta_partitioned_timestamp_match(
+        SHORT_SERIES_1, SHORT_SERIES_2, 2)
+    assert res2 == {1: 2, 3: 3, 4: 5, 8: 7, 10: 10}
+
+
+def test_delta_partitioned_single_stamp():
+    """Test a single-stamp first series is matched."""
+    res = ssdts.delta_partitioned_timestamp_match([5], [3, 6, 9], 2)
+    assert res == {5: 6}
+
+
+def test_delta_partitioned_last_bucket():
+    """Test a gap just before the last stamp puts it in a bucket of its
+    own."""
+    buckets = []
+
+    def _recording_match(timestamps1, timestamps2, delta):
+        buckets.append((timestamps1.tolist(), timestamps2.tolist()))
+        return ssdts.hybrid_timestamp_match(timestamps1, timestamps2, delta)
+
+    res = ssdts.delta_partitioned_timestamp_match(
+        [1, 2, 20], [2, 3, 19], 2, _recording_match)
+    assert res == {1: 2, 2: 3, 20: 19}
+    assert buckets == [([1, 2], [2, 3]), ([20], [19])]
+
+
+@pytest.mark.parametrize('matching_func', [
+    ssdts.dynamic_timestamp_match,
+    ssdts.popping_greedy_timestamp_match,
+])
+def test_delta_partitioned_n_jobs(matching_func):
+    """Test buckets matched concurrently are matched as one by one."""
+    ts1 = [1, 3, 4, 8, 10, 20, 21, 30, 34]
+    ts2 = [2, 3, 5, 6, 7, 10, 11, 19, 22, 31, 33]
+    res = ssdts.delta_partitioned_timestamp_match(
+        ts1, ts2, 1, matching_func, n_jobs=2)
+    assert res == ssdts.delta_partitioned_timestamp_match(
+        ts1, ts2, 1, matching_func)
+
+
+class _UnusableKernels:
+    """Stands in for the AOT-compiled kernels, failing on any use."""
+
+    def __getattr__(self, name):
+        raise AssertionError('AOT-compiled kernel {} used'.format(name))
+
+
+def test_delta_partitioned_n_jobs_threads(monkeypatch):
+    """Test threads match buckets on the JIT-compiled kernels, even where
+    the AOT-compiled ones are built."""
+    pytest.importorskip('numba')
+    ts1 = [1, 3, 4, 8, 10, 20, 21, 30, 34]
+    ts2 = [2, 3, 5, 6, 7, 10, 11, 19, 22, 31, 33]
+    expected = ssdts.delta_partitioned_timestamp_match(
+        ts1, ts2, 1, ssdts.dynamic_timestamp_match)
+    monkeypatch.setattr(core, '_dp_native', _UnusableKernels())
+    executor, _ = core._partition_executor(ssdts.dynamic_timestamp_match, 2)
+    with executor:
+        assert isinstance(executor, ThreadPoolExecutor)
+    res = ssdts.delta_partitioned_timestamp_match(
+        ts1, ts2, 1, ssdts.dynamic_timestamp_match, n_jobs=2)
+    assert res == expected
+
+
+def _unusable_parallel_match(*args):
+    raise AssertionError('parallel fill used')
+
+
+def test_delta_partitioned_n_jobs_serial_fill(monkeypatch):
+    """Test threads never fill dense buckets with the parallel kernel."""
+    numba = pytest.importorskip('numba')
+    ts1 = list(range(10)) + list(range(1000, 1010))
+    ts2 = list(range(10)) + list(range(1000, 1010))
+    expected = ssdts.delta_partitioned_timestamp_match(
+        ts1, ts2, 20, ssdts.dynamic_timestamp_match)
+    # launches the numba threading layer before faking more threads
+    numba.get_num_threads()
+    monkeypatch.setattr(numba, 'get_num_threads', lambda: 4)
+    monkeypatch.setattr(core, '_PARALLEL_MIN_DIAGONAL', 1)
+    monkeypatch.setattr(
+        core, '_parallel_directions_match', _unusable_parallel_match)
+    # matched one by one, the dense buckets are filled in parallel
+    with pytest.raises(AssertionError):
+        ssdts.delta_partitioned_timestamp_match(
+            ts1, ts2, 20, ssdts.dynamic_timestamp_match)
+    res = ssdts.delta_partitioned_timestamp_match(
+        ts1, ts2, 20, ssdts.dynamic_timestamp_match, n_jobs=2)
+    assert res == expected
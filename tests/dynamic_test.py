@@ -0,0 +1,154 @@
+"""Test the dynamic_timestamp_match function."""
+
+import numpy as np
+import pytest
+
+import ssdts_matching as ssdts
+from ssdts_matching import core
+from ssdts_matching.core import (
+    _dp_fill,
+    _dp_score_only,
+    _delta_band,
+    _directions_match,
+    _parallel_directions_match,
+)
+
+from .shared import (
+    SHORT_SERIES_1,
+    SHORT_SERIES_2,
+)
+
+
+def test_dynamic_1():
+    """Test 1 for the dynamic_timestamp_match function."""
+    res1 = ssdts.dynamic_timestamp_match(SHORT_SERIES_1, SHORT_SERIES_2, 1)
+    assert len(res1) == 2
+    assert res1[3] == 3
+    assert res1[10] == 10
+
+    res2 = ssdts.dynamic_timestamp_match(SHORT_SERIES_1, SHORT_SERIES_2, 2)
+    assert len(res2) == 5
+    assert res2[1] == 2
+    assert res2[3] == 3
+    assert res2[4] == 5
+    assert res2[8] == 7
+    assert res2[10] == 10
+
+
+def test_dynamic_empty():
+    """Test the dynamic_timestamp_match function on empty series."""
+    assert ssdts.dynamic_timestamp_match([], SHORT_SERIES_2, 2) == {}
+    assert ssdts.dynamic_timestamp_match(SHORT_SERIES_1, [], 2) == {}
+
+
+def test_dynamic_zero_delta():
+    """Test no pair is matched with a zero delta."""
+    band_lo, band_hi = _delta_band(
+        np.arange(20, dtype=np.int64), np.arange(20, dtype=np.int64), 0)
+    assert (band_hi == band_lo).all()
+    assert ssdts.dynamic_timestamp_match(
+        list(range(20)), list(range(20)), 0) == {}
+
+
+def test_dynamic_parallel_fill():
+    """Test the anti-diagonal full fill agrees with the banded one."""
+    rng = np.random.RandomState(0)
+    ts1 = np.sort(rng.choice(2000, 300, replace=False)).astype(np.int64)
+    ts2 = np.sort(rng.choice(2000, 350, replace=False)).astype(np.int64)
+    band_lo, band_hi = _delta_band(ts1, ts2, 40)
+    banded = {}
+    _directions_match(ts1, ts2, band_lo, band_hi, 40, 400, banded)
+    full = {}
+    _parallel_directions_match(ts1, ts2, 40, 400, full)
+    assert banded == full
+
+
+def _matching_error(ts1_to_ts2, timestamps1, delta):
+    unmatched = len(timestamps1) - len(ts1_to_ts2)
+    return sum(abs(t1 - t2) for t1, t2 in ts1_to_ts2.items()) + \
+        unmatched * delta * 10
+
+
+def test_dynamic_hirschberg(monkeypatch):
+    """Test the linear-space matching is as good as the direct one."""
+    rng = np.random.RandomState(1)
+    ts1 = np.sort(rng.choice(400, 60, replace=False)).tolist()
+    ts2 = np.sort(rng.choice(400, 70, replace=False)).tolist()
+    direct = ssdts.dynamic_timestamp_match(ts1, ts2, 5)
+    monkeypatch.setattr(core, '_MAX_DIRECTIONS_CELLS', 16)
+    linear = ssdts.dynamic_timestamp_match(ts1, ts2, 5)
+    assert len(set(linear.values())) == len(linear)
+    assert all(abs(t1 - t2) < 5 for t1, t2 in linear.items())
+    assert _matching_error(linear, ts1, 5) == _matching_error(direct, ts1, 5)
+
+
+def _full_score_row(ts1, ts2, delta, unmatch_penalty):
+    row = [j * unmatch_penalty for j in range(len(ts1) + 1)]
+    for timestamp in ts2:
+        prev_row = row
+        row = [prev_row[0]]
+        for j, timestamp1 in enumerate(ts1, 1):
+            min_score = min(prev_row[j], row[j-1] + unmatch_penalty)
+            diff = abs(timestamp1 - timestamp)
+            if diff < delta:
+                min_score = min(min_score, prev_row[j-1] + diff)
+            row.append(min_score)
+    return row
+
+
+@pytest.mark.parametrize('delta', [0, 3, 20, 1000])
+def test_dynamic_banded_score_row(delta):
+    """Test the banded score row agrees with the full score matrix."""
+    rng = np.random.RandomState(4)
+    ts1 = np.sort(rng.choice(300, 50, replace=False)).astype(np.int64)
+    ts2 = np.sort(rng.choice(300, 60, replace=False)).astype(np.int64)
+    scores = _dp_score_only(ts1, ts2, delta, delta * 10)
+    assert scores.tolist() == _full_score_row(
+        ts1.tolist(), ts2.tolist(), delta, delta * 10)
+
+
+def test_dynamic_native_fill():
+    """Test the AOT-compiled fill agrees with the JIT-compiled one."""
+    native = pytest.importorskip('ssdts_matching._dp_native')
+    rng = np.random.RandomState(2)
+    ts1 = np.sort(rng.choice(500, 80, replace=False)).astype(np.int64)
+    ts2 = np.sort(rng.choice(500, 90, replace=False)).astype(np.int64)
+    band_lo, band_hi = _delta_band(ts1, ts2, 20)
+    band_widths = band_hi - band_lo
+    band_offsets = np.cumsum(band_widths) - band_widths
+    col_scores = np.zeros(81, dtype=np.int64)
+    directions = np.zeros(band_widths.sum() // 4 + 1, dtype=np.uint8)
+    right_left = np.zeros(91, dtype=np.uint8)
+    native_directions = np.zeros_like(directions)
+    native_right_left = np.zeros_like(right_left)
+    _dp_fill(col_scores, directions, right_left, ts1, ts2, band_lo, band_hi,
+             band_offsets, 20, 200)
+    native.dp_fill_int64(
+        ts1, ts2, band_lo, band_hi, band_offsets, col_scores,
+        native_directions, native_right_left, 20, 200)
+    assert (directions == native_directions).all()
+    assert (right_left == native_right_left).all()
+
+
+@pytest.mark.parametrize('score_dtype', [np.int32, np.int64])
+def test_dynamic_cython_fill(score_dtype):
+    """Test the Cython fill agrees with the numba one."""
+    cython_dp = pytest.importorskip('ssdts_matching._dp')
+    rng = np.random.RandomState(3)
+    ts1 = np.sort(rng.choice(500, 80, replace=False)).astype(np.int64)
+    ts2 = np.sort(rng.choice(500, 90, replace=False)).astype(np.int64)
+    band_lo, band_hi = _delta_band(ts1, ts2, 20)
+    band_widths = band_hi - band_lo
+    band_offsets = np.cumsum(band_widths) - band_widths
+    col_scores = np.zeros(81, dtype=score_dtype)
+    directions = np.zeros(band_widths.sum() // 4 + 1, dtype=np.uint8)
+    right_left = np.zeros(91, dtype=np.uint8)
+    cython_directions = np.zeros_like(directions)
+    cython_right_left = np.zeros_like(right_left)
+    _dp_fill(col_scores, directions, right_left, ts1, ts2, band_lo, band_hi,
+             band_offsets, 20, 200)
+    cython_dp.dp_fill(
+        ts1, ts2, band_lo, band_hi, band_offsets, col_scores,
+        cython_directions, cython_right_left, 20, 200)
+    assert (directions == cython_directions).all()
+    assert (right_left == cython_right_left).all()
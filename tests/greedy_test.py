@@ -0,0 +1,70 @@
+"""Test the greedy_timestamp_match function."""
+
+import numpy as np
+
+import ssdts_matching as ssdts
+from ssdts_matching.core import _greedy_with_flags
+
+from .shared import (
+    SHORT_SERIES_1,
+    SHORT_SERIES_2,
+)
+
+
+def _int64(timestamps):
+    return np.array(timestamps, dtype=np.int64)
+
+
+def test_greedy_1():
+    """Test 1 for the greedy_timestamp_match function."""
+    res1 = ssdts.greedy_timestamp_match(SHORT_SERIES_1, SHORT_SERIES_2, 1)
+    assert res1 == {3: 3, 10: 10}
+
+    res2 = ssdts.greedy_timestamp_match(SHORT_SERIES_1, SHORT_SERIES_2, 2)
+    assert res2 == {1: 2, 3: 3, 4: 3, 8: 7, 10: 10}
+
+
+def test_greedy_edges():
+    """Test stamps beyond both edges of the second series."""
+    res = ssdts.greedy_timestamp_match([1, 12], [3, 10], 3)
+    assert res == {1: 3, 12: 10}
+
+    res = ssdts.greedy_timestamp_match([1, 12], [5, 7], 3)
+    assert res == {}
+
+
+def test_greedy_ties():
+    """Test ties go to the smaller neighbour."""
+    assert ssdts.greedy_timestamp_match([5], [3, 7], 5) == {5: 3}
+
+
+def test_greedy_zero_delta():
+    """Test exact matches are kept with a zero delta."""
+    assert ssdts.greedy_timestamp_match([1, 3, 5], [3, 4], 0) == {3: 3}
+
+
+def test_greedy_flags():
+    """Test the optimality flags of the greedy matching."""
+    res, had_collision, unmatched_count = _greedy_with_flags(
+        _int64([1, 5, 9]), _int64([2, 6, 10]), 2)
+    assert res == {1: 2, 5: 6, 9: 10}
+    assert not had_collision
+    assert unmatched_count == 0
+
+    # both stamps are closest to 3
+    res, had_collision, unmatched_count = _greedy_with_flags(
+        _int64([1, 2]), _int64([3]), 5)
+    assert res == {1: 3, 2: 3}
+    assert had_collision
+    assert unmatched_count == 0
+
+    res, had_collision, unmatched_count = _greedy_with_flags(
+        _int64([1, 3, 5, 20]), _int64([3, 4]), 0)
+    assert res == {3: 3}
+    assert not had_collision
+    assert unmatched_count == 3
+
+    res, had_collision, unmatched_count = _greedy_with_flags(
+        _int64([1, 2]), _int64([]), 5)
+    assert res == {}
+    assert unmatched_count == 2
@@ -0,0 +1,58 @@
+"""Test the hybrid_timestamp_match function."""
+
+import pytest
+
+import ssdts_matching as ssdts
+from ssdts_matching import core
+
+from .shared import (
+    SHORT_SERIES_1,
+    SHORT_SERIES_2,
+)
+
+
+def test_hybrid_1():
+    """Test 1 for the hybrid_timestamp_match function."""
+    res1 = ssdts.hybrid_timestamp_match(SHORT_SERIES_1, SHORT_SERIES_2, 1)
+    assert res1 == {3: 3, 10: 10}
+
+    res2 = ssdts.hybrid_timestamp_match(SHORT_SERIES_1, SHORT_SERIES_2, 2)
+    assert res2 == {1: 2, 3: 3, 4: 5, 8: 7, 10: 10}
+
+
+@pytest.fixture
+def dynamic_calls(monkeypatch):
+    """Records the calls hybrid_timestamp_match makes to the dynamic
+    matcher."""
+    calls = []
+    dynamic_timestamp_match = core.dynamic_timestamp_match
+
+    def _recording_dynamic_match(timestamps1, timestamps2, delta):
+        calls.append((timestamps1.tolist(), timestamps2.tolist(), delta))
+        return dynamic_timestamp_match(timestamps1, timestamps2, delta)
+
+    monkeypatch.setattr(
+        core, 'dynamic_timestamp_match', _recording_dynamic_match)
+    return calls
+
+
+def test_hybrid_greedy(dynamic_calls):
+    """Test an injective greedy matching is not redone dynamically."""
+    res = ssdts.hybrid_timestamp_match([1, 5, 9], [2, 6, 10], 2)
+    assert res == {1: 2, 5: 6, 9: 10}
+    assert dynamic_calls == []
+
+
+def test_hybrid_collision(dynamic_calls):
+    """Test two stamps sharing a nearest stamp are matched dynamically."""
+    res = ssdts.hybrid_timestamp_match([1, 2], [3], 5)
+    assert res == {2: 3}
+    assert dynamic_calls == [([1, 2], [3], 5)]
+
+
+def test_hybrid_unmatched(dynamic_calls):
+    """Test a greedy matching leaving stamps unmatched is redone
+    dynamically."""
+    res = ssdts.hybrid_timestamp_match([1, 20], [2], 3)
+    assert res == {1: 2}
+    assert dynamic_calls == [([1, 20], [2], 3)]
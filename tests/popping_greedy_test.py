@@ -25,3 +25,20 @@ def test_popping_1():
     assert res2[4] == 5
     assert res2[8] == 7
     assert res2[10] == 10
+
+
+def test_popping_competing():
+    """Test consecutive stamps competing for the same series 2 stamps."""
+    res1 = ssdts.popping_greedy_timestamp_match([10, 11, 12], [11, 20], 10)
+    assert res1 == {10: 11, 11: 20}
+
+    # later stamps walk over popped neighbours on both sides
+    res2 = ssdts.popping_greedy_timestamp_match(
+        [5, 6, 7, 8], [1, 6, 7, 12], 10)
+    assert res2 == {5: 6, 6: 7, 7: 12, 8: 1}
+
+
+def test_popping_exhausted():
+    """Test stamps left after the second series is all popped."""
+    res = ssdts.popping_greedy_timestamp_match(range(8), [0, 3, 6], 10**9)
+    assert res == {0: 0, 1: 3, 2: 6}
@@ -0,0 +1,41 @@
+"""Test the vertical_aligned_timestamp_match function."""
+
+import ssdts_matching as ssdts
+from ssdts_matching.core import _relative_hybrid_match
+
+from .shared import (
+    SHORT_SERIES_1,
+    SHORT_SERIES_2,
+)
+
+
+def test_vertical_aligned_1():
+    """Test 1 for the vertical_aligned_timestamp_match function."""
+    res1 = ssdts.vertical_aligned_timestamp_match(
+        SHORT_SERIES_1, SHORT_SERIES_2, 1)
+    assert res1 == {3: 3, 10: 10}
+
+    res2 = ssdts.vertical_aligned_timestamp_match(
+        SHORT_SERIES_1, SHORT_SERIES_2, 2)
+    assert res2 == {1: 2, 3: 3, 4: 5, 8: 7, 10: 10}
+
+
+def test_vertical_aligned_edge():
+    """Test a vertical at the edge of the first series."""
+    res = ssdts.vertical_aligned_timestamp_match([1, 5, 9], [2, 6, 9, 11], 3)
+    assert res == {1: 2, 5: 6, 9: 9}
+
+    # with a zero delta only verticals can be matched
+    res = ssdts.vertical_aligned_timestamp_match([1, 3, 5], [5], 0)
+    assert res == {5: 5}
+
+
+def test_vertical_aligned_periodic():
+    """Test identical sub-problems, shifted in time, are matched alike."""
+    _relative_hybrid_match.cache_clear()
+    res = ssdts.vertical_aligned_timestamp_match(
+        [0, 1, 4, 10, 11, 14, 20, 21, 24],
+        [0, 2, 5, 10, 12, 15, 20, 22, 25], 2)
+    assert res == {
+        0: 0, 1: 2, 4: 5, 10: 10, 11: 12, 14: 15, 20: 20, 21: 22, 24: 25}
+    assert _relative_hybrid_match.cache_info().hits == 2